@@ -14,6 +14,7 @@ from sqlalchemy import (
     Date,
     UniqueConstraint
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
@@ -168,7 +169,8 @@ class TokenBaseModel(Base):
         nullable=False,
         default=generate_secure_token
     )
-    expires_at: Mapped[datetime] = mapped_column(
+    _expires_at: Mapped[datetime] = mapped_column(
+        "expires_at",
         DateTime(timezone=True),
         nullable=False,
         default=lambda: datetime.now(timezone.utc) + timedelta(days=1)
@@ -176,6 +178,27 @@ class TokenBaseModel(Base):
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
+    @hybrid_property
+    def expires_at(self) -> datetime:
+        """
+        Return the expiration date as a timezone-aware UTC datetime.
+
+        Backends such as SQLite drop the timezone on read, so naive values are treated as UTC.
+        """
+        expires_at = self._expires_at
+        if expires_at is not None and expires_at.tzinfo is None:
+            return expires_at.replace(tzinfo=timezone.utc)
+        return expires_at
+
+    @expires_at.inplace.setter
+    def _expires_at_setter(self, value: datetime) -> None:
+        self._expires_at = value
+
+    @expires_at.inplace.expression
+    @classmethod
+    def _expires_at_expression(cls) -> Mapped[datetime]:
+        return cls._expires_at
+
 
 class ActivationTokenModel(TokenBaseModel):
     __tablename__ = "activation_tokens"
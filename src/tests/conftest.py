@@ -1,14 +1,28 @@
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy import insert
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-from config import get_settings, get_accounts_email_notificator, get_s3_storage_client
+from config import get_settings, get_accounts_email_notificator, get_jwt_auth_manager, get_s3_storage_client
 from database import (
+    Base,
     reset_database,
+    get_db,
     get_db_contextmanager,
     UserGroupEnum,
-    UserGroupModel
+    UserGroupModel,
+    UserModel,
+    RefreshTokenModel,
+    MovieModel
 )
 from database.populate import CSVDatabaseSeeder
 from main import app
@@ -17,6 +31,55 @@ from security.token_manager import JWTAuthManager
 from storages import S3StorageClient
 from tests.doubles.fakes.storage import FakeS3Storage
 from tests.doubles.stubs.emails import StubEmailSender
+from tests.factories import UNKNOWN_USER_ID, make_user
+
+
+def _cache_decoded_token(decode: Callable[[str], dict]) -> Callable[[str], dict]:
+    """
+    Memoize a token decoder by the raw token string.
+
+    Only successfully decoded tokens are cached, so invalid and expired tokens still raise
+    on every call. Each caller gets its own copy of the payload, keeping the cached entry
+    safe from mutation.
+    """
+    cached_decode = lru_cache(maxsize=256)(decode)
+
+    def decode_token(token: str) -> dict:
+        return dict(cached_decode(token))
+
+    return decode_token
+
+
+def _create_jwt_manager() -> JWTAuthManagerInterface:
+    """
+    Create a JWT authentication manager configured with the testing settings.
+
+    Signature verification of access and refresh tokens is cached per token, since the
+    same tokens are decoded repeatedly by tests and by the endpoints they call.
+    """
+    settings = get_settings()
+    manager = JWTAuthManager(
+        secret_key_access=settings.SECRET_KEY_ACCESS,
+        secret_key_refresh=settings.SECRET_KEY_REFRESH,
+        algorithm=settings.JWT_SIGNING_ALGORITHM
+    )
+    manager.decode_access_token = _cache_decoded_token(manager.decode_access_token)
+    manager.decode_refresh_token = _cache_decoded_token(manager.decode_refresh_token)
+    return manager
+
+
+_jwt_manager = _create_jwt_manager()
+STATIC_REFRESH_TOKEN = _jwt_manager.create_refresh_token({"user_id": 1})
+EXPIRED_REFRESH_TOKEN = _jwt_manager.create_refresh_token({"user_id": 1}, expires_delta=timedelta(days=-1))
+EXPIRED_ACCESS_TOKEN = _jwt_manager.create_access_token({"user_id": 1}, expires_delta=timedelta(days=-1))
+UNKNOWN_USER_REFRESH_TOKEN = _jwt_manager.create_refresh_token({"user_id": UNKNOWN_USER_ID})
+
+# Idempotent insert of the default groups, safe to run against a database that already has some of them.
+INSERT_USER_GROUPS = (
+    sqlite_insert(UserGroupModel)
+    .values([{"name": group.value} for group in UserGroupEnum])
+    .on_conflict_do_nothing(index_elements=[UserGroupModel.name])
+)
 
 
 def pytest_configure(config):
@@ -31,20 +94,99 @@ def pytest_configure(config):
     )
 
 
-@pytest_asyncio.fixture(scope="function", autouse=True)
-async def reset_db(request):
+async def _create_test_engine(database_url: str) -> AsyncEngine:
+    """
+    Create an engine for integration tests and build the schema on it.
+
+    The SQLite driver's implicit transaction handling is disabled so SAVEPOINTs work,
+    which lets every test run inside a transaction that is rolled back afterwards.
+    `StaticPool` keeps a single connection, so the in-memory database lives as long as
+    the engine and is never written to disk.
+    """
+    engine = create_async_engine(database_url, echo=False, poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    return engine
+
+
+@pytest_asyncio.fixture(scope="session")
+async def db_engine():
     """
-    Reset the SQLite database before each test function, except for tests marked with 'e2e'.
+    Provide the database engine used by integration tests.
 
-    By default, this fixture ensures that the database is cleared and recreated before every
-    test function to maintain test isolation. However, if the test is marked with 'e2e',
-    the database reset is skipped to allow preserving state between end-to-end tests.
+    The engine points to its own in-memory SQLite database, separate from the application
+    engine used by end-to-end tests. The schema is created and the default user groups are
+    inserted once per session. Being in-memory, the database is private to the test process,
+    so each pytest-xdist worker gets its own.
+    """
+    engine = await _create_test_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.execute(INSERT_USER_GROUPS)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def seeded_db_engine(settings):
+    """
+    Provide the engine of a second in-memory database, seeded once per session with movie data.
+
+    Tests requesting `seed_database` run against this database. Since every test is rolled
+    back, the seeded data stays intact for the whole session.
+    """
+    engine = await _create_test_engine("sqlite+aiosqlite:///:memory:")
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        seeder = CSVDatabaseSeeder(csv_file_path=settings.PATH_TO_MOVIES_CSV, db_session=session)
+        await seeder.seed()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def test_db_engine(request) -> AsyncEngine | None:
+    """
+    Select the engine of the test database the current test runs against.
+
+    Tests marked with 'e2e' get None, tests requesting `seed_database` get `seeded_db_engine`
+    and all others get `db_engine`. The engine is requested lazily, so the movie data is only
+    seeded in sessions that contain tests needing it. This fixture is synchronous, so pulling
+    in the async engine fixtures does not nest event loop runs.
     """
     if "e2e" in request.keywords:
-        yield
+        return None
+    if "seed_database" in request.fixturenames:
+        return request.getfixturevalue("seeded_db_engine")
+    return request.getfixturevalue("db_engine")
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def reset_db(test_db_engine):
+    """
+    Isolate the database state of each test function, except for tests marked with 'e2e'.
+
+    For regular tests this fixture opens a connection to the engine selected by `test_db_engine`
+    and begins an outer transaction that is rolled back when the test finishes, so nothing a test
+    writes outlives it. Sessions bound to the yielded connection turn their commits into SAVEPOINT
+    releases. If the test is marked with 'e2e', nothing is done to allow preserving state between
+    end-to-end tests.
+    """
+    if test_db_engine is None:
+        yield None
     else:
-        await reset_database()
-        yield
+        async with test_db_engine.connect() as conn:
+            transaction = await conn.begin()
+            yield conn
+            await transaction.rollback()
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -88,6 +230,21 @@ async def s3_storage_fake():
     return FakeS3Storage()
 
 
+@pytest.fixture(scope="session")
+def oversize_avatar_path(tmp_path_factory) -> Path:
+    """
+    Provide the path to a JPEG avatar larger than the 1 MB upload limit.
+
+    The avatar size is checked before the image is decoded, so instead of encoding a huge image
+    the file is assembled from a JFIF header, 1 MB of padding and an end-of-image marker. It is
+    written once per session and tests stream the upload from it.
+    """
+    avatar_path = tmp_path_factory.mktemp("avatars") / "oversize_avatar.jpg"
+    jfif_header = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    avatar_path.write_bytes(jfif_header + bytes(1024 * 1024) + b"\xff\xd9")
+    return avatar_path
+
+
 @pytest_asyncio.fixture(scope="session")
 async def s3_client(settings):
     """
@@ -103,43 +260,74 @@ async def s3_client(settings):
     )
 
 
+@pytest_asyncio.fixture(scope="session")
+async def asgi_client():
+    """
+    Provide a session-wide asynchronous HTTP client bound to the application.
+
+    Requests are dispatched in-process through `ASGITransport`, so the client and its
+    transport are created once and reused by every test.
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as async_client:
+        yield async_client
+
+
 @pytest_asyncio.fixture(scope="function")
-async def client(email_sender_stub, s3_storage_fake):
+async def client(asgi_client, reset_db, jwt_manager, email_sender_stub, s3_storage_fake):
     """
     Provide an asynchronous HTTP client for testing.
 
-    Overrides the dependencies for email sender and S3 storage with test doubles.
+    Overrides the dependencies for email sender and S3 storage with test doubles, the
+    database dependency with sessions bound to the per-test connection from `reset_db`,
+    and the JWT manager with the shared caching instance, for the duration of a single test.
     """
+    async def get_test_db():
+        async with AsyncSession(
+                bind=reset_db,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_jwt_auth_manager] = lambda: jwt_manager
     app.dependency_overrides[get_accounts_email_notificator] = lambda: email_sender_stub
     app.dependency_overrides[get_s3_storage_client] = lambda: s3_storage_fake
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as async_client:
-        yield async_client
+    yield asgi_client
 
     app.dependency_overrides.clear()
 
 
 @pytest_asyncio.fixture(scope="session")
-async def e2e_client():
+async def e2e_client(asgi_client):
     """
     Provide an asynchronous HTTP client for end-to-end tests.
 
-    This client is available at the session scope.
+    This client is available at the session scope and shares the transport of `asgi_client`.
     """
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as async_client:
-        yield async_client
+    yield asgi_client
 
 
 @pytest_asyncio.fixture(scope="function")
-async def db_session():
+async def db_session(reset_db):
     """
     Provide an async database session for database interactions.
 
-    This fixture yields an async session using `get_db_contextmanager`, ensuring that the session
-    is properly closed after each test.
+    The session is bound to the per-test connection from `reset_db`, so its commits only
+    release SAVEPOINTs and everything is discarded when the outer transaction rolls back.
+    End-to-end tests get a session of the application database from `get_db_contextmanager`.
     """
-    async with get_db_contextmanager() as session:
-        yield session
+    if reset_db is None:
+        async with get_db_contextmanager() as session:
+            yield session
+    else:
+        async with AsyncSession(
+                bind=reset_db,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint"
+        ) as session:
+            yield session
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -156,56 +344,161 @@ async def e2e_db_session():
         yield session
 
 
-@pytest_asyncio.fixture(scope="function")
-async def jwt_manager() -> JWTAuthManagerInterface:
+@pytest.fixture(scope="session")
+def jwt_manager() -> JWTAuthManagerInterface:
     """
-    Asynchronous fixture to create a JWT authentication manager instance.
+    Provide the shared JWT authentication manager used by tests and by the application.
 
-    This fixture retrieves the application settings via `get_settings()` and uses them to
-    instantiate a `JWTAuthManager`. The manager is configured with the secret keys for
-    access and refresh tokens, as well as the JWT signing algorithm specified in the settings.
-
-    Returns:
-        JWTAuthManagerInterface: An instance of JWTAuthManager configured with the appropriate
-        secret keys and algorithm.
+    This is the module-level instance from `_create_jwt_manager`, whose `decode_access_token` and
+    `decode_refresh_token` are wrapped in an LRU cache. The `client` fixture installs the same
+    instance through the `get_jwt_auth_manager` override, so endpoints under test share that cache.
+    Note that a token that decoded successfully once stays accepted for the rest of the session,
+    even after its expiration time passes, so tests needing a rejected token must use a new one.
     """
-    settings = get_settings()
-    return JWTAuthManager(
-        secret_key_access=settings.SECRET_KEY_ACCESS,
-        secret_key_refresh=settings.SECRET_KEY_REFRESH,
-        algorithm=settings.JWT_SIGNING_ALGORITHM
-    )
+    return _jwt_manager
+
+
+@pytest.fixture(scope="session")
+def static_refresh_token() -> str:
+    """Provide a valid refresh token for user ID 1 that is not stored in the database."""
+    return STATIC_REFRESH_TOKEN
+
+
+@pytest.fixture(scope="session")
+def expired_refresh_token() -> str:
+    """Provide a refresh token for user ID 1 that has already expired."""
+    return EXPIRED_REFRESH_TOKEN
+
+
+@pytest.fixture(scope="session")
+def expired_access_token() -> str:
+    """Provide an access token for user ID 1 that has already expired."""
+    return EXPIRED_ACCESS_TOKEN
+
+
+@pytest.fixture(scope="session")
+def unknown_user_refresh_token() -> str:
+    """Provide a valid refresh token for a user ID that never exists in the database."""
+    return UNKNOWN_USER_REFRESH_TOKEN
 
 
 @pytest_asyncio.fixture(scope="function")
-async def seed_user_groups(db_session: AsyncSession):
+async def seed_user_groups(reset_db, db_session: AsyncSession):
     """
-    Asynchronously seed the UserGroupModel table with default user groups.
+    Ensure the UserGroupModel table contains the default user groups.
 
-    This fixture inserts all user groups defined in UserGroupEnum into the database and commits the transaction.
+    The integration test databases already contain all groups defined in UserGroupEnum, inserted
+    once per session, and every test is rolled back, so nothing is done for them. For end-to-end
+    tests the groups are inserted into the application database and the transaction is committed.
     It then yields the asynchronous database session for further testing.
     """
-    groups = [{"name": group.value} for group in UserGroupEnum]
-    await db_session.execute(insert(UserGroupModel).values(groups))
-    await db_session.commit()
+    if reset_db is None:
+        await db_session.execute(INSERT_USER_GROUPS)
+        await db_session.commit()
     yield db_session
 
 
+async def _get_group_id(engine: AsyncEngine, group: UserGroupEnum) -> int:
+    """
+    Look up the primary key of a default user group in the database behind `engine`.
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(select(UserGroupModel.id).where(UserGroupModel.name == group))
+        return result.scalar_one()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def user_group_id(db_engine) -> int:
+    """
+    Provide the primary key of the default 'user' group.
+
+    The groups are inserted once per session by `db_engine` and never modified, so the ID is looked
+    up only once and tests can pass it straight to `UserModel.create`.
+    """
+    return await _get_group_id(db_engine, UserGroupEnum.USER)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def admin_group_id(db_engine) -> int:
+    """
+    Provide the primary key of the default 'admin' group, looked up once per session.
+    """
+    return await _get_group_id(db_engine, UserGroupEnum.ADMIN)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def active_user(db_session: AsyncSession, user_group_id: int) -> UserModel:
+    """
+    Provide an active user in the default 'user' group.
+
+    The user is built with `make_user` defaults, so tests can log in with
+    `DEFAULT_USER_EMAIL` and `DEFAULT_USER_PASSWORD`.
+    """
+    user = make_user(group_id=user_group_id)
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+@pytest_asyncio.fixture(scope="function")
+async def active_user_with_refresh(
+        db_session: AsyncSession,
+        jwt_manager: JWTAuthManagerInterface,
+        settings,
+        active_user: UserModel
+) -> SimpleNamespace:
+    """
+    Provide an active user together with a refresh token stored in the database.
+
+    Returns a namespace with `user`, the raw `refresh_token` string and the stored
+    `refresh_record`.
+    """
+    refresh_token = jwt_manager.create_refresh_token({"user_id": active_user.id})
+    refresh_record = RefreshTokenModel.create(
+        user_id=active_user.id,
+        days_valid=settings.LOGIN_TIME_DAYS,
+        token=refresh_token
+    )
+    db_session.add(refresh_record)
+    await db_session.flush()
+    return SimpleNamespace(user=active_user, refresh_token=refresh_token, refresh_record=refresh_record)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def seed_database(db_session):
     """
-    Seed the database with test data if it is empty.
+    Provide a database session on top of the seeded test database.
 
-    This fixture initializes a `CSVDatabaseSeeder` and ensures the test database is populated before
-    running tests that require existing data.
+    The movie data is loaded only once per session by `seeded_db_engine`; requesting this
+    fixture makes `test_db_engine` select that engine, and `reset_db` opens the test's connection on it.
 
     :param db_session: The async database session fixture.
     :type db_session: AsyncSession
     """
-    settings = get_settings()
-    seeder = CSVDatabaseSeeder(csv_file_path=settings.PATH_TO_MOVIES_CSV, db_session=db_session)
+    yield db_session
 
-    if not await seeder.is_db_populated():
-        await seeder.seed()
 
-    yield db_session
+@pytest_asyncio.fixture(scope="session")
+async def seed_movie_count(seeded_db_engine) -> int:
+    """
+    Provide the number of movies in the seeded test database.
+
+    The seed is loaded once and every test is rolled back, so the count is computed only once
+    per session.
+    """
+    async with seeded_db_engine.connect() as conn:
+        result = await conn.execute(select(func.count(MovieModel.id)))
+        return result.scalar_one()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def seed_top_ids_desc(seeded_db_engine) -> tuple[int, ...]:
+    """
+    Provide the IDs of the newest movies in the seeded test database, in descending order.
+
+    Twenty IDs are loaded, the maximum `per_page` allowed by the movie list endpoint, so tests
+    can slice the expected IDs of any such page without querying the database themselves.
+    """
+    async with seeded_db_engine.connect() as conn:
+        result = await conn.execute(select(MovieModel.id).order_by(MovieModel.id.desc()).limit(20))
+        return tuple(result.scalars().all())
@@ -0,0 +1,129 @@
+from functools import lru_cache
+from io import BytesIO
+from typing import BinaryIO
+
+from httpx import Request
+from PIL import Image
+
+from database import UserModel
+from security.passwords import hash_password
+
+DEFAULT_USER_EMAIL = "testuser@example.com"
+DEFAULT_USER_PASSWORD = "StrongPassword123!"
+UNKNOWN_USER_ID = 9999
+
+# The profile form is validated before the access token is decoded, so validation tests only
+# need a well-formed Authorization header and never a signed token.
+UNVERIFIED_ACCESS_TOKEN = "unverified.access.token"
+
+
+def _encode_jpeg(size: tuple[int, int]) -> bytes:
+    """
+    Encode a solid-colour RGB image of the given size as JPEG.
+
+    :param size: The width and height of the image in pixels.
+    :return: The encoded JPEG bytes.
+    """
+    image_bytes = BytesIO()
+    Image.new("RGB", size, color="blue").save(image_bytes, format="JPEG")
+    return image_bytes.getvalue()
+
+
+AVATAR_JPEG = _encode_jpeg((100, 100))
+
+
+@lru_cache(maxsize=None)
+def get_password_hash(raw_password: str) -> str:
+    """
+    Hash a plain-text password once and reuse the result for the rest of the test session.
+
+    :param raw_password: The plain-text password to hash.
+    :return: The bcrypt hash of the password.
+    """
+    return hash_password(raw_password)
+
+
+def make_user(
+        group_id: int,
+        email: str = DEFAULT_USER_EMAIL,
+        password: str = DEFAULT_USER_PASSWORD,
+        is_active: bool = True
+) -> UserModel:
+    """
+    Build a new UserModel instance for tests, active by default.
+
+    Unlike `UserModel.create`, the password hash is taken from a session-wide cache,
+    so bcrypt runs at most once per distinct password.
+
+    :param group_id: The ID of the group the user belongs to.
+    :param email: The user's email address.
+    :param password: The plain-text password the user will log in with.
+    :param is_active: Whether the user account is activated.
+    :return: The new, not yet persisted, user instance.
+    """
+    return UserModel(
+        email=email,
+        _hashed_password=get_password_hash(password),
+        group_id=group_id,
+        is_active=is_active
+    )
+
+
+PROFILE_FORM_FIELDS = {
+    "first_name": "John",
+    "last_name": "Doe",
+    "gender": "man",
+    "date_of_birth": "1990-01-01",
+    "info": "This is a test profile.",
+}
+
+
+def make_profile_files(
+        avatar: tuple[str, bytes | BinaryIO, str] = ("avatar.jpg", AVATAR_JPEG, "image/jpeg"),
+        **fields: str
+) -> dict:
+    """
+    Build the multipart `files` payload of a profile creation request.
+
+    :param avatar: The file name, content and content type of the uploaded avatar. The content
+        may be raw bytes or an open binary file, which the HTTP client streams from.
+    :param fields: Form fields overriding the defaults from `PROFILE_FORM_FIELDS`.
+    :return: The payload to pass as `files` to the HTTP client.
+    """
+    files = {name: (None, value) for name, value in {**PROFILE_FORM_FIELDS, **fields}.items()}
+    file_name, content, content_type = avatar
+    if isinstance(content, bytes):
+        content = BytesIO(content)
+    files["avatar"] = (file_name, content, content_type)
+    return files
+
+
+def encode_profile_form(**fields: str) -> tuple[bytes, str]:
+    """
+    Encode a profile creation form as a ready-to-send multipart body.
+
+    Tests that post an identical form can send the encoded body as `content` instead of
+    having the HTTP client build the multipart stream on every request.
+
+    :param fields: Form fields overriding the defaults from `PROFILE_FORM_FIELDS`.
+    :return: The encoded body and the matching `Content-Type` header value.
+    """
+    request = Request("POST", "http://test", files=make_profile_files(**fields))
+    return request.read(), request.headers["Content-Type"]
+
+
+PROFILE_FORM_BODY, PROFILE_FORM_CONTENT_TYPE = encode_profile_form()
+
+
+def auth_headers(access_token: str, content_type: str | None = None) -> dict[str, str]:
+    """
+    Build the headers authenticating a request with a bearer access token.
+
+    :param access_token: The access token to send.
+    :param content_type: The `Content-Type` of a pre-encoded request body, if any.
+    :return: The request headers.
+    """
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if content_type is not None:
+        headers["Content-Type"] = content_type
+    return headers
@@ -10,13 +10,14 @@ from database import (
     UserModel,
     ActivationTokenModel,
     PasswordResetTokenModel,
-    UserGroupModel,
-    UserGroupEnum,
     RefreshTokenModel
 )
+from schemas.accounts import UserLoginResponseSchema
+from tests.factories import DEFAULT_USER_EMAIL, DEFAULT_USER_PASSWORD, UNKNOWN_USER_ID, make_user
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
-@pytest.mark.asyncio
 async def test_register_user_success(client, db_session, seed_user_groups):
     """
     Test successful user registration.
@@ -47,14 +48,9 @@ async def test_register_user_success(client, db_session, seed_user_groups):
     assert activation_token.user_id == created_user.id, "Activation token's user_id does not match."
     assert activation_token.token is not None, "Activation token has no token value."
 
-    expires_at = activation_token.expires_at
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-    assert expires_at > datetime.now(timezone.utc), "Activation token is already expired."
+    assert activation_token.expires_at > datetime.now(timezone.utc), "Activation token is already expired."
 
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize("invalid_password, expected_error", [
     ("short", "Password must contain at least 8 characters."),
     ("NoDigitHere!", "Password must contain at least one digit."),
@@ -87,7 +83,6 @@ async def test_register_user_password_validation(client, seed_user_groups, inval
     assert expected_error in str(response_data), f"Expected error message: {expected_error}"
 
 
-@pytest.mark.asyncio
 async def test_register_user_conflict(client, db_session, seed_user_groups):
     """
     Test user registration conflict.
@@ -121,7 +116,6 @@ async def test_register_user_conflict(client, db_session, seed_user_groups):
     assert response_data["detail"] == expected_message, f"Expected error message: {expected_message}"
 
 
-@pytest.mark.asyncio
 async def test_register_user_internal_server_error(client, seed_user_groups):
     """
     Test server error during user registration.
@@ -147,7 +141,6 @@ async def test_register_user_internal_server_error(client, seed_user_groups):
         assert response_data["detail"] == expected_message, f"Expected error message: {expected_message}"
 
 
-@pytest.mark.asyncio
 async def test_activate_account_success(client, db_session, seed_user_groups):
     """
     Test successful activation of a user account.
@@ -204,7 +197,6 @@ async def test_activate_account_success(client, db_session, seed_user_groups):
     assert token is None, "Activation token should be deleted after successful activation."
 
 
-@pytest.mark.asyncio
 async def test_activate_user_with_expired_token(client, db_session, seed_user_groups):
     """
     Test activation with an expired token.
@@ -250,7 +242,6 @@ async def test_activate_user_with_expired_token(client, db_session, seed_user_gr
     )
 
 
-@pytest.mark.asyncio
 async def test_activate_user_with_deleted_token(client, db_session, seed_user_groups):
     """
     Test activation with a deleted token.
@@ -300,7 +291,6 @@ async def test_activate_user_with_deleted_token(client, db_session, seed_user_gr
     )
 
 
-@pytest.mark.asyncio
 async def test_activate_already_active_user(client, db_session, seed_user_groups):
     """
     Test activation of an already active user.
@@ -344,7 +334,6 @@ async def test_activate_already_active_user(client, db_session, seed_user_groups
     )
 
 
-@pytest.mark.asyncio
 async def test_request_password_reset_token_success(client, db_session, seed_user_groups):
     """
     Test successful password reset token request.
@@ -385,14 +374,11 @@ async def test_request_password_reset_token_success(client, db_session, seed_use
     reset_token = result_token.scalars().first()
     assert reset_token is not None, "Password reset token should be created for the user."
 
-    expires_at = reset_token.expires_at
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-    assert expires_at > datetime.now(timezone.utc), "Password reset token should have a future expiration date."
+    assert reset_token.expires_at > datetime.now(timezone.utc), (
+        "Password reset token should have a future expiration date."
+    )
 
 
-@pytest.mark.asyncio
 async def test_request_password_reset_token_nonexistent_user(client, db_session):
     """
     Test password reset token request for a non-existent user.
@@ -414,7 +400,6 @@ async def test_request_password_reset_token_nonexistent_user(client, db_session)
     assert reset_token_count == 0, "No password reset token should be created for non-existent user."
 
 
-@pytest.mark.asyncio
 async def test_request_password_reset_token_for_inactive_user(client, db_session, seed_user_groups):
     """
     Test password reset token request for a registered but inactive user.
@@ -448,7 +433,6 @@ async def test_request_password_reset_token_for_inactive_user(client, db_session
     assert reset_token_count == 0, "No password reset token should be created for an inactive user."
 
 
-@pytest.mark.asyncio
 async def test_reset_password_success(client, db_session, seed_user_groups):
     """
     Test the complete password reset flow.
@@ -512,7 +496,6 @@ async def test_reset_password_success(client, db_session, seed_user_groups):
     assert created_user.verify_password(new_password), "Password should be updated successfully in the database."
 
 
-@pytest.mark.asyncio
 async def test_reset_password_invalid_email(client, db_session):
     """
     Test password reset with an email that does not exist in the database.
@@ -531,7 +514,6 @@ async def test_reset_password_invalid_email(client, db_session):
     assert response.json()["detail"] == "Invalid email or token.", "Unexpected error message."
 
 
-@pytest.mark.asyncio
 async def test_reset_password_invalid_token(client, db_session, seed_user_groups):
     """
     Test password reset with an incorrect token.
@@ -573,7 +555,6 @@ async def test_reset_password_invalid_token(client, db_session, seed_user_groups
     assert token_record is None, "Invalid token was not removed."
 
 
-@pytest.mark.asyncio
 async def test_reset_password_expired_token(client, db_session, seed_user_groups):
     """
     Test password reset with an expired token.
@@ -623,7 +604,6 @@ async def test_reset_password_expired_token(client, db_session, seed_user_groups
     assert expired_token is None, "Expired token was not removed."
 
 
-@pytest.mark.asyncio
 async def test_reset_password_sqlalchemy_error(client, db_session, seed_user_groups):
     """
     Test password reset when a database commit raises SQLAlchemyError.
@@ -677,66 +657,40 @@ async def test_reset_password_sqlalchemy_error(client, db_session, seed_user_gro
     )
 
 
-@pytest.mark.asyncio
-async def test_login_user_success(client, db_session, jwt_manager, seed_user_groups):
+async def test_login_user_success(client, db_session, jwt_manager, active_user):
     """
     Test successful login.
 
     Validates that access and refresh tokens are returned, the refresh token is stored in the database,
     and both tokens are valid.
     """
-    user_payload = {
-        "email": "testuser@example.com",
-        "password": "StrongPassword123!"
-    }
-
-    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
-    result = await db_session.execute(stmt)
-    user_group = result.scalars().first()
-    assert user_group is not None, "Default user group should exist."
-
-    user = UserModel.create(
-        email=user_payload["email"],
-        raw_password=user_payload["password"],
-        group_id=user_group.id
-    )
-    user.is_active = True
-    db_session.add(user)
-    await db_session.commit()
-
+    user = active_user
     login_payload = {
-        "email": user_payload["email"],
-        "password": user_payload["password"]
+        "email": DEFAULT_USER_EMAIL,
+        "password": DEFAULT_USER_PASSWORD
     }
     response = await client.post("/api/v1/accounts/login/", json=login_payload)
     assert response.status_code == 201, "Expected status code 201 for successful login."
-    response_data = response.json()
-    assert "access_token" in response_data, "Access token is missing in the response."
-    assert "refresh_token" in response_data, "Refresh token is missing in the response."
-    assert response_data["access_token"], "Access token is empty."
-    assert response_data["refresh_token"], "Refresh token is empty."
+    response_data = UserLoginResponseSchema.model_validate(response.json())
+    assert response_data.access_token, "Access token is empty."
+    assert response_data.refresh_token, "Refresh token is empty."
 
-    access_token_data = jwt_manager.decode_access_token(response_data["access_token"])
+    access_token_data = jwt_manager.decode_access_token(response_data.access_token)
     assert access_token_data["user_id"] == user.id, "Access token does not contain correct user ID."
 
-    refresh_token_data = jwt_manager.decode_refresh_token(response_data["refresh_token"])
+    refresh_token_data = jwt_manager.decode_refresh_token(response_data.refresh_token)
     assert refresh_token_data["user_id"] == user.id, "Refresh token does not contain correct user ID."
 
     stmt_refresh = select(RefreshTokenModel).where(RefreshTokenModel.user_id == user.id)
     result_refresh = await db_session.execute(stmt_refresh)
     refresh_token_record = result_refresh.scalars().first()
     assert refresh_token_record is not None, "Refresh token was not stored in the database."
-    assert refresh_token_record.token == response_data["refresh_token"], "Stored refresh token does not match."
-
-    expires_at = refresh_token_record.expires_at
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    assert refresh_token_record.token == response_data.refresh_token, "Stored refresh token does not match."
 
-    assert expires_at > datetime.now(timezone.utc), "Refresh token is already expired."
+    assert refresh_token_record.expires_at > datetime.now(timezone.utc), "Refresh token is already expired."
 
 
-@pytest.mark.asyncio
-async def test_login_user_invalid_cases(client, db_session, seed_user_groups):
+async def test_login_user_invalid_cases(client, db_session, user_group_id):
     """
     Test login with invalid cases:
     1. Non-existent user.
@@ -755,19 +709,13 @@ async def test_login_user_invalid_cases(client, db_session, seed_user_groups):
         "email": "testuser@example.com",
         "password": "CorrectPassword123!"
     }
-    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
-    result = await db_session.execute(stmt)
-    user_group = result.scalars().first()
-    assert user_group is not None, "Default user group should exist."
-
-    user = UserModel.create(
+    user = make_user(
+        group_id=user_group_id,
         email=user_payload["email"],
-        raw_password=user_payload["password"],
-        group_id=user_group.id
+        password=user_payload["password"]
     )
-    user.is_active = True
     db_session.add(user)
-    await db_session.commit()
+    await db_session.flush()
 
     login_payload_incorrect_password = {
         "email": user_payload["email"],
@@ -779,8 +727,7 @@ async def test_login_user_invalid_cases(client, db_session, seed_user_groups):
         "Unexpected error message for incorrect password."
 
 
-@pytest.mark.asyncio
-async def test_login_user_inactive_account(client, db_session, seed_user_groups):
+async def test_login_user_inactive_account(client, db_session, user_group_id):
     """
     Test login with an inactive user account.
 
@@ -792,19 +739,14 @@ async def test_login_user_inactive_account(client, db_session, seed_user_groups)
         "password": "StrongPassword123!"
     }
 
-    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
-    result = await db_session.execute(stmt)
-    user_group = result.scalars().first()
-    assert user_group is not None, "User group not found."
-
-    user = UserModel.create(
+    user = make_user(
+        group_id=user_group_id,
         email=user_payload["email"],
-        raw_password=user_payload["password"],
-        group_id=user_group.id
+        password=user_payload["password"],
+        is_active=False
     )
-    user.is_active = False
     db_session.add(user)
-    await db_session.commit()
+    await db_session.flush()
 
     login_payload = {
         "email": user_payload["email"],
@@ -817,34 +759,15 @@ async def test_login_user_inactive_account(client, db_session, seed_user_groups)
         "Unexpected error message for inactive user."
 
 
-@pytest.mark.asyncio
-async def test_login_user_commit_error(client, db_session, seed_user_groups):
+async def test_login_user_commit_error(client, active_user):
     """
     Test login when a database commit error occurs.
 
     Validates that the endpoint returns a 500 status code and an appropriate error message.
     """
-    user_payload = {
-        "email": "testuser@example.com",
-        "password": "StrongPassword123!"
-    }
-    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
-    result = await db_session.execute(stmt)
-    user_group = result.scalars().first()
-    assert user_group is not None, "Default user group should exist."
-
-    user = UserModel.create(
-        email=user_payload["email"],
-        raw_password=user_payload["password"],
-        group_id=user_group.id
-    )
-    user.is_active = True
-    db_session.add(user)
-    await db_session.commit()
-
     login_payload = {
-        "email": user_payload["email"],
-        "password": user_payload["password"]
+        "email": DEFAULT_USER_EMAIL,
+        "password": DEFAULT_USER_PASSWORD
     }
 
     with patch("routes.accounts.AsyncSession.commit", side_effect=SQLAlchemyError):
@@ -856,46 +779,18 @@ async def test_login_user_commit_error(client, db_session, seed_user_groups):
     )
 
 
-@pytest.mark.asyncio
-async def test_refresh_access_token_success(client, db_session, jwt_manager, seed_user_groups):
+async def test_refresh_access_token_success(client, jwt_manager, active_user_with_refresh):
     """
     Test successful access token refresh.
 
     Validates that a new access token is returned when a valid refresh token is provided.
     Steps:
-    - Create an active user in the database.
-    - Log in the user to obtain a refresh token.
+    - Create an active user with a refresh token stored in the database.
     - Use the refresh token to obtain a new access token.
     - Verify that the new access token contains the correct user ID.
     """
-    user_payload = {
-        "email": "testuser@example.com",
-        "password": "StrongPassword123!"
-    }
-    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
-    result = await db_session.execute(stmt)
-    user_group = result.scalars().first()
-    assert user_group is not None, "Default user group should exist."
-
-    user = UserModel.create(
-        email=user_payload["email"],
-        raw_password=user_payload["password"],
-        group_id=user_group.id
-    )
-    user.is_active = True
-    db_session.add(user)
-    await db_session.commit()
-
-    login_payload = {
-        "email": user_payload["email"],
-        "password": user_payload["password"]
-    }
-    login_response = await client.post("/api/v1/accounts/login/", json=login_payload)
-    assert login_response.status_code == 201, "Expected status code 201 for successful login."
-    login_data = login_response.json()
-    refresh_token = login_data["refresh_token"]
-
-    refresh_payload = {"refresh_token": refresh_token}
+    user = active_user_with_refresh.user
+    refresh_payload = {"refresh_token": active_user_with_refresh.refresh_token}
     refresh_response = await client.post("/api/v1/accounts/refresh/", json=refresh_payload)
     assert refresh_response.status_code == 200, "Expected status code 200 for successful token refresh."
     refresh_data = refresh_response.json()
@@ -906,44 +801,35 @@ async def test_refresh_access_token_success(client, db_session, jwt_manager, see
     assert access_token_data["user_id"] == user.id, "Access token does not contain correct user ID."
 
 
-@pytest.mark.asyncio
-async def test_refresh_access_token_expired_token(client, jwt_manager):
+async def test_refresh_access_token_expired_token(client, expired_refresh_token):
     """
     Test refresh token with expired token.
 
     Validates that a 400 status code and "Token has expired." message are returned
     when the refresh token is expired.
     """
-    expired_token = jwt_manager.create_refresh_token(
-        {"user_id": 1},
-        expires_delta=timedelta(days=-1)
-    )
-
-    refresh_payload = {"refresh_token": expired_token}
+    refresh_payload = {"refresh_token": expired_refresh_token}
     refresh_response = await client.post("/api/v1/accounts/refresh/", json=refresh_payload)
 
     assert refresh_response.status_code == 400, "Expected status code 400 for expired token."
     assert refresh_response.json()["detail"] == "Token has expired.", "Unexpected error message."
 
 
-@pytest.mark.asyncio
-async def test_refresh_access_token_token_not_found(client, jwt_manager):
+async def test_refresh_access_token_token_not_found(client, static_refresh_token):
     """
     Test refresh token when token is not found in the database.
 
     Validates that a 401 status code and 'Refresh token not found.' message
     are returned when the refresh token is not stored in the database.
     """
-    refresh_token = jwt_manager.create_refresh_token({"user_id": 1})
-    refresh_payload = {"refresh_token": refresh_token}
+    refresh_payload = {"refresh_token": static_refresh_token}
     refresh_response = await client.post("/api/v1/accounts/refresh/", json=refresh_payload)
 
     assert refresh_response.status_code == 401, "Expected status code 401 for token not found."
     assert refresh_response.json()["detail"] == "Refresh token not found.", "Unexpected error message."
 
 
-@pytest.mark.asyncio
-async def test_refresh_access_token_user_not_found(client, db_session, jwt_manager, seed_user_groups):
+async def test_refresh_access_token_user_not_found(client, db_session, unknown_user_refresh_token, active_user):
     """
     Test refresh token when user ID inside the token does not exist in the database.
 
@@ -957,37 +843,15 @@ async def test_refresh_access_token_user_not_found(client, db_session, jwt_manag
     - Attempt to refresh the access token using the invalid refresh token.
     - Verify that the endpoint returns a 404 error with the expected message.
     """
-    user_payload = {
-        "email": "testuser@example.com",
-        "password": "StrongPassword123!"
-    }
-
-    stmt = select(UserGroupModel).where(UserGroupModel.name == UserGroupEnum.USER)
-    result = await db_session.execute(stmt)
-    user_group = result.scalars().first()
-    assert user_group is not None, "Default user group should exist."
-
-    user = UserModel.create(
-        email=user_payload["email"],
-        raw_password=user_payload["password"],
-        group_id=user_group.id
-    )
-    user.is_active = True
-    db_session.add(user)
-    await db_session.commit()
-
-    invalid_user_id = 9999
-    refresh_token = jwt_manager.create_refresh_token({"user_id": invalid_user_id})
-
     refresh_token_record = RefreshTokenModel.create(
-        user_id=invalid_user_id,
+        user_id=UNKNOWN_USER_ID,
         days_valid=7,
-        token=refresh_token
+        token=unknown_user_refresh_token
     )
     db_session.add(refresh_token_record)
-    await db_session.commit()
+    await db_session.flush()
 
-    refresh_payload = {"refresh_token": refresh_token}
+    refresh_payload = {"refresh_token": unknown_user_refresh_token}
     refresh_response = await client.post("/api/v1/accounts/refresh/", json=refresh_payload)
 
     assert refresh_response.status_code == 404, "Expected status code 404 for non-existent user."
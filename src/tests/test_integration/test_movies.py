@@ -1,8 +1,9 @@
 import random
+from collections import defaultdict
 
 import pytest
-from sqlalchemy import select, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, func, exists, literal, union_all
+from sqlalchemy.orm import joinedload, selectinload
 
 from database import MovieModel
 from database import (
@@ -12,8 +13,23 @@ from database import (
     CountryModel
 )
 
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+_CREATE_MOVIE_PAYLOAD = {
+    "name": "New Movie",
+    "date": "2025-01-01",
+    "score": 85.5,
+    "overview": "An amazing movie.",
+    "status": "Released",
+    "budget": 1000000.00,
+    "revenue": 5000000.00,
+    "country": "US",
+    "genres": ["Action", "Adventure"],
+    "actors": ["John Doe", "Jane Doe"],
+    "languages": ["English", "French"]
+}
+
 
-@pytest.mark.asyncio
 async def test_get_movies_empty_database(client):
     """
     Test that the `/movies/` endpoint returns a 404 error when the database is empty.
@@ -21,49 +37,30 @@ async def test_get_movies_empty_database(client):
     response = await client.get("/api/v1/theater/movies/")
     assert response.status_code == 404, f"Expected 404, got {response.status_code}"
 
-    expected_detail = {"detail": "No movies found."}
-    assert response.json() == expected_detail, f"Expected {expected_detail}, got {response.json()}"
-
-
-@pytest.mark.asyncio
-async def test_get_movies_default_parameters(client, seed_database):
-    """
-    Test the `/movies/` endpoint with default pagination parameters.
-    """
-    response = await client.get("/api/v1/theater/movies/")
-    assert response.status_code == 200, "Expected status code 200, but got a different value"
-
     response_data = response.json()
 
-    assert len(response_data["movies"]) == 10, "Expected 10 movies in the response, but got a different count"
-
-    assert response_data["total_pages"] > 0, "Expected total_pages > 0, but got a non-positive value"
-    assert response_data["total_items"] > 0, "Expected total_items > 0, but got a non-positive value"
-
-    assert response_data["prev_page"] is None, "Expected prev_page to be None on the first page, but got a value"
-
-    if response_data["total_pages"] > 1:
-        assert response_data["next_page"] is not None, (
-            "Expected next_page to be present when total_pages > 1, but got None"
-        )
+    expected_detail = {"detail": "No movies found."}
+    assert response_data == expected_detail, f"Expected {expected_detail}, got {response_data}"
 
 
-@pytest.mark.asyncio
-async def test_get_movies_with_custom_parameters(client, seed_database):
+@pytest.mark.parametrize("query, page, per_page", [
+    ("", 1, 10),
+    ("?page=2&per_page=5", 2, 5),
+    ("?page=1&per_page=20", 1, 20),
+], ids=["default", "custom", "per_page_maximum"])
+async def test_get_movies_pagination_parameters(client, seed_database, seed_movie_count, query, page, per_page):
     """
-    Test the `/movies/` endpoint with custom pagination parameters.
+    Test the `/movies/` endpoint with default, custom and maximum allowed pagination parameters.
     """
-    page = 2
-    per_page = 5
-
-    response = await client.get(f"/api/v1/theater/movies/?page={page}&per_page={per_page}")
+    response = await client.get(f"/api/v1/theater/movies/{query}")
 
     assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
 
     response_data = response.json()
 
-    assert len(response_data["movies"]) == per_page, (
-        f"Expected {per_page} movies in the response, but got {len(response_data['movies'])}"
+    expected_count = min(per_page, seed_movie_count - (page - 1) * per_page)
+    assert len(response_data["movies"]) == expected_count, (
+        f"Expected {expected_count} movies in the response, but got {len(response_data['movies'])}"
     )
 
     assert response_data["total_pages"] > 0, "Expected total_pages > 0, but got a non-positive value"
@@ -74,6 +71,8 @@ async def test_get_movies_with_custom_parameters(client, seed_database):
             f"Expected prev_page to be '/theater/movies/?page={page - 1}&per_page={per_page}', "
             f"but got {response_data['prev_page']}"
         )
+    else:
+        assert response_data["prev_page"] is None, "Expected prev_page to be None on the first page, but got a value"
 
     if page < response_data["total_pages"]:
         assert response_data["next_page"] == f"/theater/movies/?page={page + 1}&per_page={per_page}", (
@@ -84,7 +83,6 @@ async def test_get_movies_with_custom_parameters(client, seed_database):
         assert response_data["next_page"] is None, "Expected next_page to be None on the last page, but got a value"
 
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize("page, per_page, expected_detail", [
     (0, 10, "Input should be greater than or equal to 1"),
     (1, 0, "Input should be greater than or equal to 1"),
@@ -109,33 +107,12 @@ async def test_invalid_page_and_per_page(client, page, per_page, expected_detail
     )
 
 
-@pytest.mark.asyncio
-async def test_per_page_maximum_allowed_value(client, seed_database):
-    """
-    Test the `/movies/` endpoint with the maximum allowed `per_page` value.
-    """
-    response = await client.get("/api/v1/theater/movies/?page=1&per_page=20")
-
-    assert response.status_code == 200, f"Expected status code 200, but got {response.status_code}"
-
-    response_data = response.json()
-
-    assert "movies" in response_data, "Response missing 'movies' field."
-    assert len(response_data["movies"]) <= 20, (
-        f"Expected at most 20 movies, but got {len(response_data['movies'])}"
-    )
-
-
-@pytest.mark.asyncio
-async def test_page_exceeds_maximum(client, db_session, seed_database):
+async def test_page_exceeds_maximum(client, seed_database, seed_movie_count):
     """
     Test the `/movies/` endpoint with a page number that exceeds the maximum.
     """
     per_page = 10
-
-    count_stmt = select(func.count(MovieModel.id))
-    result = await db_session.execute(count_stmt)
-    total_movies = result.scalar_one()
+    total_movies = seed_movie_count
 
     max_page = (total_movies + per_page - 1) // per_page
 
@@ -147,8 +124,7 @@ async def test_page_exceeds_maximum(client, db_session, seed_database):
     assert "detail" in response_data, "Response missing 'detail' field."
 
 
-@pytest.mark.asyncio
-async def test_movies_sorted_by_id_desc(client, db_session, seed_database):
+async def test_movies_sorted_by_id_desc(client, seed_database, seed_top_ids_desc):
     """
     Test that movies are returned sorted by `id` in descending order
     and match the expected data from the database.
@@ -159,11 +135,7 @@ async def test_movies_sorted_by_id_desc(client, db_session, seed_database):
 
     response_data = response.json()
 
-    stmt = select(MovieModel).order_by(MovieModel.id.desc()).limit(10)
-    result = await db_session.execute(stmt)
-    expected_movies = result.scalars().all()
-
-    expected_movie_ids = [movie.id for movie in expected_movies]
+    expected_movie_ids = list(seed_top_ids_desc[:10])
     returned_movie_ids = [movie["id"] for movie in response_data["movies"]]
 
     assert returned_movie_ids == expected_movie_ids, (
@@ -172,8 +144,7 @@ async def test_movies_sorted_by_id_desc(client, db_session, seed_database):
     )
 
 
-@pytest.mark.asyncio
-async def test_movie_list_with_pagination(client, db_session, seed_database):
+async def test_movie_list_with_pagination(client, seed_database, seed_movie_count, seed_top_ids_desc):
     """
     Test the `/movies/` endpoint with pagination parameters.
 
@@ -192,25 +163,14 @@ async def test_movie_list_with_pagination(client, db_session, seed_database):
 
     response_data = response.json()
 
-    count_stmt = select(func.count(MovieModel.id))
-    count_result = await db_session.execute(count_stmt)
-    total_items = count_result.scalar_one()
+    total_items = seed_movie_count
 
     total_pages = (total_items + per_page - 1) // per_page
 
     assert response_data["total_items"] == total_items, "Total items mismatch."
     assert response_data["total_pages"] == total_pages, "Total pages mismatch."
 
-    stmt = (
-        select(MovieModel)
-        .order_by(MovieModel.id.desc())
-        .offset(offset)
-        .limit(per_page)
-    )
-    result = await db_session.execute(stmt)
-    expected_movies = result.scalars().all()
-
-    expected_movie_ids = [movie.id for movie in expected_movies]
+    expected_movie_ids = list(seed_top_ids_desc[offset:offset + per_page])
     returned_movie_ids = [movie["id"] for movie in response_data["movies"]]
 
     assert expected_movie_ids == returned_movie_ids, "Movies on the page mismatch."
@@ -222,7 +182,6 @@ async def test_movie_list_with_pagination(client, db_session, seed_database):
     assert response_data["next_page"] == expected_next_page, "Next page link mismatch."
 
 
-@pytest.mark.asyncio
 async def test_movies_fields_match_schema(client, db_session, seed_database):
     """
     Test that each movie in the response matches the fields defined in `MovieListItemSchema`.
@@ -244,24 +203,27 @@ async def test_movies_fields_match_schema(client, db_session, seed_database):
         )
 
 
-@pytest.mark.asyncio
-async def test_get_movie_by_id_not_found(client):
+@pytest.mark.parametrize("method, path, body", [
+    ("get", "/api/v1/theater/movies/99999/", None),
+    ("delete", "/api/v1/theater/movies/99999/", None),
+    ("patch", "/api/v1/theater/movies/99999/", {"name": "Non-existent Movie", "score": 90.0}),
+])
+async def test_movie_not_found(client, method, path, body):
     """
-    Test that the `/movies/{movie_id}` endpoint returns a 404 error
+    Test that the `/movies/{movie_id}/` endpoints return a 404 error
     when a movie with the given ID does not exist.
     """
-    movie_id = 1
-
-    response = await client.get(f"/api/v1/theater/movies/{movie_id}/")
+    request_kwargs = {"json": body} if body else {}
+    response = await getattr(client, method)(path, **request_kwargs)
     assert response.status_code == 404, f"Expected status code 404, but got {response.status_code}"
 
     response_data = response.json()
-    assert response_data == {"detail": "Movie with the given ID was not found."}, (
-        f"Expected error message not found. Got: {response_data}"
+    expected_detail = "Movie with the given ID was not found."
+    assert response_data["detail"] == expected_detail, (
+        f"Expected detail message: {expected_detail}, but got: {response_data['detail']}"
     )
 
 
-@pytest.mark.asyncio
 async def test_get_movie_by_id_valid(client, db_session, seed_database):
     """
     Test that the `/movies/{movie_id}` endpoint returns the correct movie details
@@ -272,13 +234,9 @@ async def test_get_movie_by_id_valid(client, db_session, seed_database):
     - The response status code is 200.
     - The movie's `id` and `name` in the response match the expected values from the database.
     """
-    stmt_min = select(MovieModel.id).order_by(MovieModel.id.asc()).limit(1)
-    result_min = await db_session.execute(stmt_min)
-    min_id = result_min.scalars().first()
-
-    stmt_max = select(MovieModel.id).order_by(MovieModel.id.desc()).limit(1)
-    result_max = await db_session.execute(stmt_max)
-    max_id = result_max.scalars().first()
+    stmt_bounds = select(func.min(MovieModel.id), func.max(MovieModel.id))
+    result_bounds = await db_session.execute(stmt_bounds)
+    min_id, max_id = result_bounds.one()
 
     random_id = random.randint(min_id, max_id)
 
@@ -296,7 +254,6 @@ async def test_get_movie_by_id_valid(client, db_session, seed_database):
     assert response_data["name"] == expected_movie.name, "Returned name does not match the expected name."
 
 
-@pytest.mark.asyncio
 async def test_get_movie_by_id_fields_match_database(client, db_session, seed_database):
     """
     Test that the `/movies/{movie_id}` endpoint returns all fields matching the database data.
@@ -305,9 +262,9 @@ async def test_get_movie_by_id_fields_match_database(client, db_session, seed_da
         select(MovieModel)
         .options(
             joinedload(MovieModel.country),
-            joinedload(MovieModel.genres),
-            joinedload(MovieModel.actors),
-            joinedload(MovieModel.languages),
+            selectinload(MovieModel.genres),
+            selectinload(MovieModel.actors),
+            selectinload(MovieModel.languages),
         )
         .limit(1)
     )
@@ -333,47 +290,25 @@ async def test_get_movie_by_id_fields_match_database(client, db_session, seed_da
     assert response_data["country"]["code"] == random_movie.country.code, "Country code does not match."
     assert response_data["country"]["name"] == random_movie.country.name, "Country name does not match."
 
-    actual_genres = sorted(response_data["genres"], key=lambda x: x["id"])
-    expected_genres = sorted(
-        [{"id": genre.id, "name": genre.name} for genre in random_movie.genres],
-        key=lambda x: x["id"]
-    )
-    assert actual_genres == expected_genres, "Genres do not match."
+    assert {(genre["id"], genre["name"]) for genre in response_data["genres"]} == {
+        (genre.id, genre.name) for genre in random_movie.genres
+    }, "Genres do not match."
 
-    actual_actors = sorted(response_data["actors"], key=lambda x: x["id"])
-    expected_actors = sorted(
-        [{"id": actor.id, "name": actor.name} for actor in random_movie.actors],
-        key=lambda x: x["id"]
-    )
-    assert actual_actors == expected_actors, "Actors do not match."
+    assert {(actor["id"], actor["name"]) for actor in response_data["actors"]} == {
+        (actor.id, actor.name) for actor in random_movie.actors
+    }, "Actors do not match."
 
-    actual_languages = sorted(response_data["languages"], key=lambda x: x["id"])
-    expected_languages = sorted(
-        [{"id": lang.id, "name": lang.name} for lang in random_movie.languages],
-        key=lambda x: x["id"]
-    )
-    assert actual_languages == expected_languages, "Languages do not match."
+    assert {(lang["id"], lang["name"]) for lang in response_data["languages"]} == {
+        (lang.id, lang.name) for lang in random_movie.languages
+    }, "Languages do not match."
 
 
-@pytest.mark.asyncio
 async def test_create_movie_and_related_models(client, db_session):
     """
     Test that a new movie is created successfully and related models
     (genres, actors, languages) are created if they do not exist.
     """
-    movie_data = {
-        "name": "New Movie",
-        "date": "2025-01-01",
-        "score": 85.5,
-        "overview": "An amazing movie.",
-        "status": "Released",
-        "budget": 1000000.00,
-        "revenue": 5000000.00,
-        "country": "US",
-        "genres": ["Action", "Adventure"],
-        "actors": ["John Doe", "Jane Doe"],
-        "languages": ["English", "French"]
-    }
+    movie_data = _CREATE_MOVIE_PAYLOAD
 
     response = await client.post("/api/v1/theater/movies/", json=movie_data)
     assert response.status_code == 201, f"Expected status code 201, but got {response.status_code}"
@@ -384,44 +319,44 @@ async def test_create_movie_and_related_models(client, db_session):
     assert response_data["score"] == movie_data["score"], "Movie score does not match."
     assert response_data["overview"] == movie_data["overview"], "Movie overview does not match."
 
-    for genre_name in movie_data["genres"]:
-        stmt = select(GenreModel).where(GenreModel.name == genre_name)
-        result = await db_session.execute(stmt)
-        genre = result.scalars().first()
-        assert genre is not None, f"Genre '{genre_name}' was not created."
-
-    for actor_name in movie_data["actors"]:
-        stmt = select(ActorModel).where(ActorModel.name == actor_name)
-        result = await db_session.execute(stmt)
-        actor = result.scalars().first()
-        assert actor is not None, f"Actor '{actor_name}' was not created."
-
-    for language_name in movie_data["languages"]:
-        stmt = select(LanguageModel).where(LanguageModel.name == language_name)
-        result = await db_session.execute(stmt)
-        language = result.scalars().first()
-        assert language is not None, f"Language '{language_name}' was not created."
-
-    stmt = select(CountryModel).where(CountryModel.code == movie_data["country"])
+    stmt = union_all(
+        select(literal("genres").label("kind"), GenreModel.name.label("name"))
+        .where(GenreModel.name.in_(movie_data["genres"])),
+        select(literal("actors"), ActorModel.name).where(ActorModel.name.in_(movie_data["actors"])),
+        select(literal("languages"), LanguageModel.name).where(LanguageModel.name.in_(movie_data["languages"])),
+        select(literal("country"), CountryModel.code).where(CountryModel.code == movie_data["country"]),
+    )
     result = await db_session.execute(stmt)
-    country = result.scalars().first()
-    assert country is not None, f"Country '{movie_data['country']}' was not created."
+    created = defaultdict(set)
+    for kind, name in result:
+        created[kind].add(name)
+
+    assert created["genres"] == set(movie_data["genres"]), (
+        f"Genres were not created. Expected: {movie_data['genres']}, but found: {created['genres']}"
+    )
+    assert created["actors"] == set(movie_data["actors"]), (
+        f"Actors were not created. Expected: {movie_data['actors']}, but found: {created['actors']}"
+    )
+    assert created["languages"] == set(movie_data["languages"]), (
+        f"Languages were not created. Expected: {movie_data['languages']}, but found: {created['languages']}"
+    )
+    assert created["country"], f"Country '{movie_data['country']}' was not created."
 
 
-@pytest.mark.asyncio
 async def test_create_movie_duplicate_error(client, db_session, seed_database):
     """
     Test that trying to create a movie with the same name and date as an existing movie
     results in a 409 conflict error.
     """
-    stmt = select(MovieModel).limit(1)
+    stmt = select(MovieModel.name, MovieModel.date).limit(1)
     result = await db_session.execute(stmt)
-    existing_movie = result.scalars().first()
+    existing_movie = result.first()
     assert existing_movie is not None, "No existing movies found in the database."
+    name, date = existing_movie
 
     movie_data = {
-        "name": existing_movie.name,
-        "date": existing_movie.date.isoformat(),
+        "name": name,
+        "date": date.isoformat(),
         "score": 90.0,
         "overview": "Duplicate movie test.",
         "status": "Released",
@@ -445,55 +380,31 @@ async def test_create_movie_duplicate_error(client, db_session, seed_database):
     )
 
 
-@pytest.mark.asyncio
 async def test_delete_movie_success(client, db_session, seed_database):
     """
     Test the `/movies/{movie_id}/` endpoint for successful movie deletion.
     """
-    stmt = select(MovieModel).limit(1)
+    stmt = select(MovieModel.id).limit(1)
     result = await db_session.execute(stmt)
-    movie = result.scalars().first()
-    assert movie is not None, "No movies found in the database to delete."
-
-    movie_id = movie.id
+    movie_id = result.scalars().first()
+    assert movie_id is not None, "No movies found in the database to delete."
 
     response = await client.delete(f"/api/v1/theater/movies/{movie_id}/")
     assert response.status_code == 204, f"Expected status code 204, but got {response.status_code}"
 
-    stmt_check = select(MovieModel).where(MovieModel.id == movie_id)
-    result_check = await db_session.execute(stmt_check)
-    deleted_movie = result_check.scalars().first()
-    assert deleted_movie is None, f"Movie with ID {movie_id} was not deleted."
-
-
-@pytest.mark.asyncio
-async def test_delete_movie_not_found(client):
-    """
-    Test the `/movies/{movie_id}/` endpoint with a non-existent movie ID.
-    """
-    non_existent_id = 99999
-
-    response = await client.delete(f"/api/v1/theater/movies/{non_existent_id}/")
-    assert response.status_code == 404, f"Expected status code 404, but got {response.status_code}"
-
-    response_data = response.json()
-    expected_detail = "Movie with the given ID was not found."
-    assert response_data["detail"] == expected_detail, (
-        f"Expected detail message: {expected_detail}, but got: {response_data['detail']}"
-    )
+    stmt_check = select(exists().where(MovieModel.id == movie_id))
+    movie_exists = await db_session.scalar(stmt_check)
+    assert not movie_exists, f"Movie with ID {movie_id} was not deleted."
 
 
-@pytest.mark.asyncio
 async def test_update_movie_success(client, db_session, seed_database):
     """
     Test the `/movies/{movie_id}/` endpoint for successfully updating a movie's details.
     """
-    stmt = select(MovieModel).limit(1)
+    stmt = select(MovieModel.id).limit(1)
     result = await db_session.execute(stmt)
-    movie = result.scalars().first()
-    assert movie is not None, "No movies found in the database to update."
-
-    movie_id = movie.id
+    movie_id = result.scalars().first()
+    assert movie_id is not None, "No movies found in the database to update."
     update_data = {
         "name": "Updated Movie Name",
         "score": 95.0,
@@ -507,32 +418,9 @@ async def test_update_movie_success(client, db_session, seed_database):
         f"Expected detail message: 'Movie updated successfully.', but got: {response_data['detail']}"
     )
 
-    await db_session.rollback()
-
-    stmt_check = select(MovieModel).where(MovieModel.id == movie_id)
+    stmt_check = select(MovieModel.name, MovieModel.score).where(MovieModel.id == movie_id)
     result_check = await db_session.execute(stmt_check)
-    updated_movie = result_check.scalars().first()
+    updated_movie = result_check.one()
 
     assert updated_movie.name == update_data["name"], "Movie name was not updated."
     assert updated_movie.score == update_data["score"], "Movie score was not updated."
-
-
-@pytest.mark.asyncio
-async def test_update_movie_not_found(client):
-    """
-    Test the `/movies/{movie_id}/` endpoint with a non-existent movie ID.
-    """
-    non_existent_id = 99999
-    update_data = {
-        "name": "Non-existent Movie",
-        "score": 90.0
-    }
-
-    response = await client.patch(f"/api/v1/theater/movies/{non_existent_id}/", json=update_data)
-    assert response.status_code == 404, f"Expected status code 404, but got {response.status_code}"
-
-    response_data = response.json()
-    expected_detail = "Movie with the given ID was not found."
-    assert response_data["detail"] == expected_detail, (
-        f"Expected detail message: {expected_detail}, but got: {response_data['detail']}"
-    )
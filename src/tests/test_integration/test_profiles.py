@@ -1,59 +1,49 @@
-from datetime import datetime, timedelta
 from unittest.mock import patch
 
 import pytest
-from io import BytesIO
-from PIL import Image
-from sqlalchemy import select, func
+from sqlalchemy import select, func, exists
 
-from database import UserModel, UserProfileModel
+from database import UserProfileModel
 from exceptions import S3FileUploadError
+from tests.factories import (
+    PROFILE_FORM_BODY,
+    PROFILE_FORM_CONTENT_TYPE,
+    UNVERIFIED_ACCESS_TOKEN,
+    auth_headers,
+    make_profile_files,
+    make_user
+)
+
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.unit]
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
+@pytest.mark.parametrize("by_admin", [False, True], ids=["self", "admin"])
 async def test_create_user_profile_with_fake_s3(
-        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+        db_session, active_user, admin_group_id, jwt_manager, s3_storage_fake, client, by_admin
 ):
     """
-    Positive test for creating a user profile.
+    Positive test for creating a user profile, either by the user or by an admin on their behalf.
 
     Steps:
-    1. Create a test user and activate them.
-    2. Generate an access token using `jwt_manager`.
+    1. Create an active user and, for the admin case, an admin user.
+    2. Generate an access token for the requesting user using `jwt_manager`.
     3. Send a profile creation request with an avatar.
     4. Verify that the avatar was uploaded to `FakeS3Storage`.
     5. Verify that the profile was created in the database.
     """
-    user = UserModel.create(email="test@mate.com", raw_password="TestPassword123!", group_id=1)
-    user.is_active = True
-    db_session.add(user)
-    await db_session.commit()
+    requester = active_user
+    if by_admin:
+        requester = make_user(group_id=admin_group_id, email="admin@mate.com")
+        db_session.add(requester)
+        await db_session.commit()
 
-    stmt = select(UserModel).where(UserModel.email == "test@mate.com")
-    result = await db_session.execute(stmt)
-    user = result.scalars().first()
+    access_token = jwt_manager.create_access_token({"user_id": requester.id})
 
-    access_token = jwt_manager.create_access_token({"user_id": user.id})
-
-    img = Image.new("RGB", (100, 100), color="blue")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
-    avatar_key = f"avatars/{user.id}_avatar.jpg"
-    profile_url = f"/api/v1/profiles/users/{user.id}/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
+    avatar_key = f"avatars/{active_user.id}_avatar.jpg"
+    profile_url = f"/api/v1/profiles/users/{active_user.id}/profile/"
+    headers = auth_headers(access_token, content_type=PROFILE_FORM_CONTENT_TYPE)
 
-    response = await client.post(profile_url, headers=headers, files=files)
+    response = await client.post(profile_url, headers=headers, content=PROFILE_FORM_BODY)
     assert response.status_code == 201, f"Expected 201, got {response.status_code}"
     profile_data = response.json()
 
@@ -68,10 +58,10 @@ async def test_create_user_profile_with_fake_s3(
     actual_url = await s3_storage_fake.get_file_url(avatar_key)
     assert actual_url == expected_url, "Avatar URL does not match expected URL."
 
-    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user.id)
+    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == active_user.id)
     result_profile = await db_session.execute(stmt_profile)
     profile_in_db = result_profile.scalars().first()
-    assert profile_in_db, f"Profile for user {user.id} should exist!"
+    assert profile_in_db, f"Profile for user {active_user.id} should exist!"
 
     assert profile_in_db.first_name == "john", "First name is incorrect!"
     assert profile_in_db.last_name == "doe", "Last name is incorrect!"
@@ -81,8 +71,6 @@ async def test_create_user_profile_with_fake_s3(
     assert profile_in_db.avatar == avatar_key, "Avatar key in database does not match!"
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
 @pytest.mark.parametrize(
     "headers, expected_status, expected_detail",
     [
@@ -112,9 +100,7 @@ async def test_create_user_profile_invalid_auth(client, headers, expected_status
     assert response.json()["detail"] == expected_detail, f"Unexpected error message: {response.json()['detail']}"
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
-async def test_create_user_profile_expired_token(client, jwt_manager):
+async def test_create_user_profile_expired_token(client, expired_access_token):
     """
     Test profile creation with an expired access token.
 
@@ -122,27 +108,9 @@ async def test_create_user_profile_expired_token(client, jwt_manager):
     - The request should fail with 401 Unauthorized.
     - The error message should be: "Token has expired."
     """
-    expired_time = datetime.now() - timedelta(days=1)
-    with patch("security.token_manager.datetime") as mock_datetime:
-        mock_datetime.now.return_value = expired_time
-        expired_token = jwt_manager.create_access_token({"user_id": 1})
-
     profile_url = "/api/v1/profiles/users/1/profile/"
-    headers = {"Authorization": f"Bearer {expired_token}"}
-
-    img = Image.new("RGB", (100, 100), color="blue")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "Test profile."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
+    headers = auth_headers(expired_access_token)
+    files = make_profile_files(info="Test profile.")
 
     response = await client.post(profile_url, headers=headers, files=files)
 
@@ -151,90 +119,8 @@ async def test_create_user_profile_expired_token(client, jwt_manager):
         f"Unexpected error message: {response.json()['detail']}"
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
-async def test_admin_creates_user_profile(
-        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
-):
-    """
-    Test that an admin can create a profile for another user.
-
-    Steps:
-    1. Create an admin user and a regular user.
-    2. Generate an access token for the admin.
-    3. Send a request to create a profile for the regular user.
-    4. Verify that the avatar was uploaded to FakeS3Storage.
-    5. Verify that the profile was created in the database.
-    """
-    admin_user = UserModel.create(email="admin@mate.com", raw_password="AdminPass123!", group_id=3)
-    admin_user.is_active = True
-    db_session.add(admin_user)
-
-    regular_user = UserModel.create(email="user@mate.com", raw_password="UserPass123!", group_id=1)
-    regular_user.is_active = True
-    db_session.add(regular_user)
-
-    await db_session.commit()
-
-    stmt = select(UserModel).where(UserModel.email.in_(["admin@mate.com", "user@mate.com"]))
-    result = await db_session.execute(stmt)
-    users = result.scalars().all()
-
-    users_dict = {user.email: user for user in users}
-    admin_user = users_dict["admin@mate.com"]
-    regular_user = users_dict["user@mate.com"]
-
-    admin_token = jwt_manager.create_access_token({"user_id": admin_user.id})
-
-    img = Image.new("RGB", (100, 100), color="blue")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
-    avatar_key = f"avatars/{regular_user.id}_avatar.jpg"
-    profile_url = f"/api/v1/profiles/users/{regular_user.id}/profile/"
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "Test profile."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
-
-    response = await client.post(profile_url, headers=headers, files=files)
-    assert response.status_code == 201, f"Expected 201, got {response.status_code}"
-    profile_data = response.json()
-
-    assert profile_data["first_name"] == "john"
-    assert profile_data["last_name"] == "doe"
-    assert profile_data["gender"] == "man"
-    assert profile_data["date_of_birth"] == "1990-01-01"
-    assert "avatar" in profile_data, "Avatar URL is missing!"
-
-    assert avatar_key in s3_storage_fake.storage, "Avatar file was not uploaded to Fake S3 Storage!"
-    expected_url = f"http://fake-s3.local/{avatar_key}"
-    actual_url = await s3_storage_fake.get_file_url(avatar_key)
-    assert actual_url == expected_url, "Avatar URL does not match expected URL."
-
-    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == regular_user.id)
-    result_profile = await db_session.execute(stmt_profile)
-    profile_in_db = result_profile.scalars().first()
-    assert profile_in_db, f"Profile for user {regular_user.id} should exist!"
-
-    assert profile_in_db.first_name == "john", "First name is incorrect!"
-    assert profile_in_db.last_name == "doe", "Last name is incorrect!"
-    assert profile_in_db.gender == "man", "Gender is incorrect!"
-    assert str(profile_in_db.date_of_birth) == "1990-01-01", "Date of birth is incorrect!"
-    assert profile_in_db.info == "Test profile.", "Profile info is incorrect!"
-    assert profile_in_db.avatar == avatar_key, "Avatar key in database does not match!"
-
-
-@pytest.mark.asyncio
-@pytest.mark.unit
 async def test_user_cannot_create_another_user_profile(
-        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+        db_session, user_group_id, reset_db, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that a regular user cannot create a profile for another user.
@@ -245,56 +131,29 @@ async def test_user_cannot_create_another_user_profile(
     3. Attempt to create a profile for the second user.
     4. Verify that the request fails with 403 Forbidden and that no profile is created.
     """
-    user_1 = UserModel.create(email="user1@mate.com", raw_password="User1Pass123!", group_id=1)  # 1 = User
-    user_1.is_active = True
-    db_session.add(user_1)
-
-    user_2 = UserModel.create(email="user2@mate.com", raw_password="User2Pass123!", group_id=1)  # 1 = User
-    user_2.is_active = True
-    db_session.add(user_2)
-
+    user_1 = make_user(group_id=user_group_id, email="user1@mate.com")
+    user_2 = make_user(group_id=user_group_id, email="user2@mate.com")
+    db_session.add_all([user_1, user_2])
     await db_session.commit()
 
-    stmt = select(UserModel).where(UserModel.email.in_(["user1@mate.com", "user2@mate.com"]))
-    result = await db_session.execute(stmt)
-    users = result.scalars().all()
-    users_dict = {user.email: user for user in users}
-    user_1 = users_dict["user1@mate.com"]
-    user_2 = users_dict["user2@mate.com"]
-
     user_1_token = jwt_manager.create_access_token({"user_id": user_1.id})
 
-    img = Image.new("RGB", (100, 100), color="red")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
     profile_url = f"/api/v1/profiles/users/{user_2.id}/profile/"
-    headers = {"Authorization": f"Bearer {user_1_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "Attempting unauthorized profile creation."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
+    headers = auth_headers(user_1_token)
+    files = make_profile_files(info="Attempting unauthorized profile creation.")
 
     response = await client.post(profile_url, headers=headers, files=files)
     assert response.status_code == 403, f"Expected 403, got {response.status_code}"
     assert response.json()["detail"] == "You don't have permission to edit this profile.", \
         f"Unexpected error message: {response.json()['detail']}"
 
-    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user_2.id)
-    result_profile = await db_session.execute(stmt_profile)
-    profile_in_db = result_profile.scalars().first()
-    assert profile_in_db is None, "Profile should not have been created!"
+    stmt_profile = select(exists().where(UserProfileModel.user_id == user_2.id))
+    profile_exists = await db_session.scalar(stmt_profile)
+    assert not profile_exists, "Profile should not have been created!"
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
 async def test_inactive_user_cannot_create_profile(
-        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+        db_session, user_group_id, reset_db, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that an inactive user cannot create a profile.
@@ -305,48 +164,28 @@ async def test_inactive_user_cannot_create_profile(
     3. Attempt to create a profile.
     4. Verify that the request fails with 401 Unauthorized and that no profile is created.
     """
-    user = UserModel.create(email="inactive@mate.com", raw_password="TestPassword123!", group_id=1)
-    user.is_active = False
+    user = make_user(group_id=user_group_id, email="inactive@mate.com", is_active=False)
     db_session.add(user)
     await db_session.commit()
 
-    stmt = select(UserModel).where(UserModel.email == "inactive@mate.com")
-    result = await db_session.execute(stmt)
-    user = result.scalars().first()
-
     access_token = jwt_manager.create_access_token({"user_id": user.id})
 
-    img = Image.new("RGB", (100, 100), color="gray")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
     profile_url = f"/api/v1/profiles/users/{user.id}/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "Attempting to create a profile while inactive."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
+    headers = auth_headers(access_token)
+    files = make_profile_files(info="Attempting to create a profile while inactive.")
 
     response = await client.post(profile_url, headers=headers, files=files)
     assert response.status_code == 401, f"Expected 401, got {response.status_code}"
     assert response.json()[
                "detail"] == "User not found or not active.", f"Unexpected error message: {response.json()['detail']}"
 
-    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user.id)
-    result_profile = await db_session.execute(stmt_profile)
-    profile_in_db = result_profile.scalars().first()
-    assert profile_in_db is None, "Profile should not have been created!"
+    stmt_profile = select(exists().where(UserProfileModel.user_id == user.id))
+    profile_exists = await db_session.scalar(stmt_profile)
+    assert not profile_exists, "Profile should not have been created!"
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
 async def test_cannot_create_profile_twice(
-        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+        db_session, active_user, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that a user cannot create a profile twice.
@@ -357,52 +196,28 @@ async def test_cannot_create_profile_twice(
     3. Attempt to create another profile.
     4. Verify that the request fails with 400 Bad Request and only one profile exists in the database.
     """
-    user = UserModel.create(email="test@mate.com", raw_password="TestPassword123!", group_id=1)
-    user.is_active = True
-    db_session.add(user)
-    await db_session.commit()
+    access_token = jwt_manager.create_access_token({"user_id": active_user.id})
 
-    stmt_user = select(UserModel).where(UserModel.email == "test@mate.com")
-    result_user = await db_session.execute(stmt_user)
-    user = result_user.scalars().first()
+    profile_url = f"/api/v1/profiles/users/{active_user.id}/profile/"
+    headers = auth_headers(access_token, content_type=PROFILE_FORM_CONTENT_TYPE)
 
-    access_token = jwt_manager.create_access_token({"user_id": user.id})
-
-    img = Image.new("RGB", (100, 100), color="blue")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
-    profile_url = f"/api/v1/profiles/users/{user.id}/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
-
-    response1 = await client.post(profile_url, headers=headers, files=files)
+    response1 = await client.post(profile_url, headers=headers, content=PROFILE_FORM_BODY)
     assert response1.status_code == 201, f"Expected 201, got {response1.status_code}"
 
-    response2 = await client.post(profile_url, headers=headers, files=files)
+    response2 = await client.post(profile_url, headers=headers, content=PROFILE_FORM_BODY)
     assert response2.status_code == 400, f"Expected 400, got {response2.status_code}"
     assert response2.json()["detail"] == "User already has a profile.", (
         f"Unexpected error message: {response2.json()['detail']}"
     )
 
-    stmt_count = select(func.count(UserProfileModel.id)).where(UserProfileModel.user_id == user.id)
+    stmt_count = select(func.count(UserProfileModel.id)).where(UserProfileModel.user_id == active_user.id)
     result_count = await db_session.execute(stmt_count)
     profiles_count = result_count.scalar_one()
     assert profiles_count == 1, f"Expected only one profile, but found {profiles_count}"
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
 async def test_profile_creation_fails_on_s3_upload_error(
-        db_session, seed_user_groups, reset_db, jwt_manager, s3_storage_fake, client
+        db_session, active_user, jwt_manager, s3_storage_fake, client
 ):
     """
     Test that profile creation fails if S3 upload fails.
@@ -413,223 +228,76 @@ async def test_profile_creation_fails_on_s3_upload_error(
     3. Attempt to create a profile.
     4. Verify that the request fails with 500 Internal Server Error and no profile is created in the database.
     """
-    user = UserModel.create(email="test@mate.com", raw_password="TestPassword123!", group_id=1)
-    user.is_active = True
-    db_session.add(user)
-    await db_session.commit()
-
-    stmt = select(UserModel).where(UserModel.email == "test@mate.com")
-    result = await db_session.execute(stmt)
-    user = result.scalars().first()
-
-    access_token = jwt_manager.create_access_token({"user_id": user.id})
-
-    img = Image.new("RGB", (100, 100), color="blue")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
+    access_token = jwt_manager.create_access_token({"user_id": active_user.id})
 
-    profile_url = f"/api/v1/profiles/users/{user.id}/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
+    profile_url = f"/api/v1/profiles/users/{active_user.id}/profile/"
+    headers = auth_headers(access_token, content_type=PROFILE_FORM_CONTENT_TYPE)
 
     with patch.object(s3_storage_fake, "upload_file", side_effect=S3FileUploadError("Simulated S3 failure")):
-        response = await client.post(profile_url, headers=headers, files=files)
+        response = await client.post(profile_url, headers=headers, content=PROFILE_FORM_BODY)
 
     assert response.status_code == 500, f"Expected 500, got {response.status_code}"
     assert response.json()["detail"] == "Failed to upload avatar. Please try again later.", (
         f"Unexpected error message: {response.json()['detail']}"
     )
 
-    stmt_profile = select(UserProfileModel).where(UserProfileModel.user_id == user.id)
-    result_profile = await db_session.execute(stmt_profile)
-    profile_in_db = result_profile.scalars().first()
-    assert profile_in_db is None, "Profile should not be created when S3 upload fails!"
-
-
-@pytest.mark.asyncio
-@pytest.mark.unit
-@pytest.mark.parametrize("first_name, last_name, expected_error", [
-    ("John1", "Doe", "John1 contains non-english letters"),
-    ("John", "Doe1", "Doe1 contains non-english letters"),
+    stmt_profile = select(exists().where(UserProfileModel.user_id == active_user.id))
+    profile_exists = await db_session.scalar(stmt_profile)
+    assert not profile_exists, "Profile should not be created when S3 upload fails!"
+
+
+@pytest.mark.parametrize("overrides, expected_error", [
+    ({"first_name": "John1"}, "John1 contains non-english letters"),
+    ({"last_name": "Doe1"}, "Doe1 contains non-english letters"),
+    ({"avatar": ("avatar.gif", b"fake_image", "image/gif")}, "Invalid image format"),
+    ({"gender": "other"}, "Gender must be one of"),
+    ({"date_of_birth": "1800-01-01"}, "Invalid birth date - year must be greater than 1900."),
+    ({"date_of_birth": "2010-01-01"}, "You must be at least 18 years old to register."),
+    ({"info": ""}, "Info field cannot be empty or contain only spaces."),
+    ({"info": "   "}, "Info field cannot be empty or contain only spaces."),
+], ids=[
+    "first_name", "last_name", "avatar_format", "gender", "birth_year", "underage", "empty_info", "blank_info"
 ])
-async def test_profile_creation_invalid_name(client, jwt_manager, first_name, last_name, expected_error):
+async def test_profile_creation_validation_errors(client, overrides, expected_error):
     """
-    Test that profile creation fails if the first_name or last_name contains non-English letters.
+    Test that profile creation fails if a form field is invalid.
 
-    This test sends a profile creation request with invalid names and expects a 422 response
-    with an error message containing the specified error text.
+    Each case sends a profile creation request with a single invalid field (non-English names,
+    an unsupported GIF avatar, an unknown gender, an invalid birth date or empty info) and expects
+    a 422 response with an error message containing the specified error text.
     """
-    access_token = jwt_manager.create_access_token({"user_id": 1})
-
     profile_url = "/api/v1/profiles/users/1/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, first_name),
-        "last_name": (None, last_name),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.jpg", BytesIO(b"fake_image"), "image/jpeg"),
-    }
+    headers = auth_headers(UNVERIFIED_ACCESS_TOKEN)
+    files = make_profile_files(**overrides)
 
     response = await client.post(profile_url, headers=headers, files=files)
 
     assert response.status_code == 422, f"Expected 422, got {response.status_code}"
-    assert expected_error in str(response.json()), f"Unexpected error message: {response.json()}"
-
-
-@pytest.mark.asyncio
-@pytest.mark.unit
-async def test_profile_creation_invalid_avatar_format(client, jwt_manager):
-    """
-    Test that profile creation fails if the avatar has an unsupported format.
-
-    This test sends a profile creation request with an avatar file in GIF format,
-    which is unsupported. It expects the endpoint to return a 422 status code with an
-    error message indicating "Invalid image format".
-    """
-    access_token = jwt_manager.create_access_token({"user_id": 1})
-
-    profile_url = "/api/v1/profiles/users/1/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.gif", BytesIO(b"fake_image"), "image/gif"),
-    }
-
-    response = await client.post(profile_url, headers=headers, files=files)
-
-    assert response.status_code == 422, f"Expected 422, got {response.status_code}"
-    assert "Invalid image format" in str(response.json()), f"Unexpected error message: {response.json()}"
+    response_data = response.json()
+    assert any(expected_error in error["msg"] for error in response_data["detail"]), (
+        f"Unexpected error message: {response_data}"
+    )
 
 
-@pytest.mark.asyncio
-@pytest.mark.unit
-async def test_profile_creation_avatar_too_large(db_session, client, jwt_manager):
+async def test_profile_creation_avatar_too_large(client, oversize_avatar_path):
     """
     Test that profile creation fails if the avatar exceeds 1MB.
 
-    This test attempts to create a profile using a large JPEG image (created in-memory)
-    that exceeds the allowed size limit (1MB). It expects the endpoint to return a 422 status code
-    with an error message indicating that the image size exceeds the allowed limit.
-    """
-    access_token = jwt_manager.create_access_token({"user_id": 1})
-
-    img = Image.new("RGB", (10000, 10000), color="blue")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
-    profile_url = "/api/v1/profiles/users/1/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.jpg", img_bytes, "image/jpeg"),
-    }
-
-    response = await client.post(profile_url, headers=headers, files=files)
-    assert response.status_code == 422, f"Expected 422, got {response.status_code}"
-    assert "Image size exceeds 1 MB" in str(response.json()), f"Unexpected error message: {response.json()}"
-
-
-@pytest.mark.asyncio
-@pytest.mark.unit
-async def test_profile_creation_invalid_gender(client, jwt_manager):
-    """
-    Test that profile creation fails if gender is invalid.
-
-    This test sends a profile creation request with an invalid gender value ("other").
-    It expects the endpoint to return a 422 status code with an error message indicating that
-    the gender must be one of the allowed values.
+    This test attempts to create a profile using a synthesized JPEG-headed file larger than the allowed
+    size limit (1MB), streamed from disk. The file is rejected on size before it is decoded, so it expects
+    the endpoint to return a 422 status code with an error message indicating that the image size exceeds
+    the allowed limit.
     """
-    access_token = jwt_manager.create_access_token({"user_id": 1})
-
     profile_url = "/api/v1/profiles/users/1/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "other"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.jpg", BytesIO(b"fake_image"), "image/jpeg"),
-    }
+    headers = auth_headers(UNVERIFIED_ACCESS_TOKEN)
 
-    response = await client.post(profile_url, headers=headers, files=files)
-
-    assert response.status_code == 422, f"Expected 422, got {response.status_code}"
-    assert "Gender must be one of" in str(response.json()), f"Unexpected error message: {response.json()}"
-
-
-@pytest.mark.asyncio
-@pytest.mark.unit
-@pytest.mark.parametrize("birth_date, expected_error", [
-    ("1800-01-01", "Invalid birth date - year must be greater than 1900."),
-    ("2010-01-01", "You must be at least 18 years old to register."),
-])
-async def test_profile_creation_invalid_birth_date(client, jwt_manager, birth_date, expected_error):
-    """
-    Test that profile creation fails if birth_date is invalid.
+    with oversize_avatar_path.open("rb") as avatar_file:
+        files = make_profile_files(avatar=("avatar.jpg", avatar_file, "image/jpeg"))
 
-    This test sends a profile creation request with an invalid birth_date value and expects
-    the endpoint to return a 422 status code along with an appropriate error message.
-    """
-    access_token = jwt_manager.create_access_token({"user_id": 1})
-    profile_url = "/api/v1/profiles/users/1/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, birth_date),
-        "info": (None, "This is a test profile."),
-        "avatar": ("avatar.jpg", BytesIO(b"fake_image"), "image/jpeg"),
-    }
-
-    response = await client.post(profile_url, headers=headers, files=files)
-    assert response.status_code == 422, f"Expected 422, got {response.status_code}"
-    assert expected_error in str(response.json()), f"Unexpected error message: {response.json()}"
-
-
-@pytest.mark.asyncio
-@pytest.mark.unit
-@pytest.mark.parametrize("info_value", ["", "   "])
-async def test_profile_creation_empty_info(client, jwt_manager, info_value):
-    """
-    Test that profile creation fails if the info field is empty or contains only spaces.
-
-    This test sends a profile creation request with an invalid info value and expects
-    a 422 response with an error message indicating that the info field cannot be empty.
-    """
-    access_token = jwt_manager.create_access_token({"user_id": 1})
-    profile_url = "/api/v1/profiles/users/1/profile/"
-    headers = {"Authorization": f"Bearer {access_token}"}
-    files = {
-        "first_name": (None, "John"),
-        "last_name": (None, "Doe"),
-        "gender": (None, "man"),
-        "date_of_birth": (None, "1990-01-01"),
-        "info": (None, info_value),
-        "avatar": ("avatar.jpg", BytesIO(b"fake_image"), "image/jpeg"),
-    }
+        response = await client.post(profile_url, headers=headers, files=files)
 
-    response = await client.post(profile_url, headers=headers, files=files)
     assert response.status_code == 422, f"Expected 422, got {response.status_code}"
-    assert "Info field cannot be empty or contain only spaces." in str(response.json()), \
-        f"Unexpected error message: {response.json()}"
+    response_data = response.json()
+    assert any("Image size exceeds 1 MB" in error["msg"] for error in response_data["detail"]), (
+        f"Unexpected error message: {response_data}"
+    )